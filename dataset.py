@@ -3,16 +3,26 @@ OTT-QA Dataset Loader
 支持加载 dev_linked.json 以及关联的表格和passage数据
 """
 
+import copy
 import json
-from typing import Dict, Optional, Any
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 try:
     import yaml
     YAML_AVAILABLE = True
+    # 优先使用 libyaml 提供的 C 解析器
+    YamlSafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 except ImportError:
     YAML_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from torch.utils.data import Dataset
 except ImportError:
@@ -23,8 +33,55 @@ except ImportError:
             raise NotImplementedError
 
 
+# 已解析配置文件的缓存 {路径: (mtime_ns, size, 内容)}，文件修改后自动失效（见 _cached_parse）
+_CONFIG_CACHE: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 16
+
+
+def _parse_json_file(file_path: Path) -> Any:
+    """解析JSON文件，安装了 orjson 时使用其 C 实现"""
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson 不接受 NaN / Infinity 等标准库可解析的写法，回退到 json 保持结果一致
+            return json.loads(raw.decode('utf-8'))
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _parse_yaml_file(file_path: Path) -> Dict[str, Any]:
+    """解析YAML文件"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YamlSafeLoader) or {}
+
+
+def _cached_parse(
+    cache: "OrderedDict[str, Tuple[int, int, Any]]",
+    max_size: int,
+    file_path: Path,
+    parser: Callable[[Path], Any]
+) -> Any:
+    """按 (mtime, size) 校验的 LRU 缓存解析文件，文件未修改时直接复用已解析的结果"""
+    stat = file_path.stat()
+    key = str(file_path)
+    cached = cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        cache.move_to_end(key)
+        return cached[2]
+    
+    data = parser(file_path)
+    cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+    cache.move_to_end(key)
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+    return data
+
+
 def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
-    """加载配置文件"""
+    """加载配置文件（解析结果会被缓存，每次返回独立的副本）"""
     if not YAML_AVAILABLE:
         print("Warning: PyYAML not installed, using default config")
         return {}
@@ -34,8 +91,8 @@ def load_config(config_file: str = "config.yaml") -> Dict[str, Any]:
         print(f"Warning: Config file {config_file} not found, using default config")
         return {}
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f) or {}
+    config = _cached_parse(_CONFIG_CACHE, _CONFIG_CACHE_SIZE, config_path.resolve(), _parse_yaml_file)
+    return copy.deepcopy(config)
 
 
 class TableQADataset(Dataset):
@@ -50,6 +107,7 @@ class TableQADataset(Dataset):
         reference_file: 标准答案文件路径（覆盖配置文件）
         load_tables: 是否加载表格数据（覆盖配置文件）
         load_passages: 是否加载passage数据（覆盖配置文件）
+        cache_size: 表格/passage 文件的 LRU 缓存条目数，默认 0 不缓存（覆盖配置文件）
         config_file: 配置文件路径
     """
     
@@ -62,6 +120,7 @@ class TableQADataset(Dataset):
         reference_file: Optional[str] = None,
         load_tables: Optional[bool] = None,
         load_passages: Optional[bool] = None,
+        cache_size: Optional[int] = None,
         config_file: str = "config.yaml"
     ):
         # 加载配置文件
@@ -101,47 +160,68 @@ class TableQADataset(Dataset):
         self.load_passages = load_passages if load_passages is not None else ds_config.get('load_passages', True)
         self.verbose = ds_config.get('verbose', True)
         
+        # 同一表格通常对应多个问题，可选缓存已解析的表格/passage文件（默认关闭）
+        cache_size = cache_size if cache_size is not None else ds_config.get('cache_size')
+        self.cache_size = cache_size if cache_size is not None else 0
+        if isinstance(self.cache_size, bool) or not isinstance(self.cache_size, int) or self.cache_size < 0:
+            raise ValueError(f"cache_size must be a non-negative integer, got {self.cache_size!r}")
+        self._json_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        
         # 加载数据
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        self.data = _parse_json_file(self.data_file)
         if self.verbose:
             print(f"Loaded {len(self.data)} samples from {self.data_file}")
         
         # 加载参考答案
         self.reference = None
         if self.reference_file and self.reference_file.exists():
-            with open(self.reference_file, 'r', encoding='utf-8') as f:
-                self.reference = json.load(f).get('reference', {})
+            self.reference = _parse_json_file(self.reference_file).get('reference', {})
             if self.verbose:
                 print(f"Loaded {len(self.reference)} reference answers")
     
     def _load_json(self, file_path: Path) -> Optional[Dict]:
-        """加载JSON文件"""
-        if not file_path.exists():
+        """加载JSON文件，不存在或解析失败时返回 None（启用缓存时返回的字典在样本间共享，请勿原地修改）"""
+        if self.cache_size == 0:
+            return self._read_json(file_path)
+        try:
+            return _cached_parse(self._json_cache, self.cache_size, file_path, self._read_json)
+        except FileNotFoundError:
             return None
+    
+    def _read_json(self, file_path: Path) -> Optional[Dict]:
+        """读取JSON文件，不存在或解析失败时返回 None"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _parse_json_file(file_path)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             return None
     
+    def _load_table(self, table_id: str) -> Optional[Dict]:
+        """加载表格数据（未启用表格时返回 None）"""
+        if not self.load_tables:
+            return None
+        return self._load_json(self.table_dir / f"{table_id}.json")
+    
+    def _load_passages(self, table_id: str) -> Optional[Dict]:
+        """加载表格关联的passage数据（未启用passage时返回 None）"""
+        if not self.load_passages:
+            return None
+        return self._load_json(self.passage_dir / f"{table_id}.json")
+    
     def get_reference_answer(self, question_id: str) -> Optional[str]:
         """获取标准答案"""
         return self.reference.get(question_id) if self.reference else None
     
     def get_passage_by_link(self, table_id: str, entity_link: str) -> Optional[str]:
         """根据实体链接获取passage文本"""
-        if not self.load_passages:
-            return None
-        passages = self._load_json(self.passage_dir / f"{table_id}.json")
+        passages = self._load_passages(table_id)
         return passages.get(entity_link) if passages else None
     
     def get_cell_content(self, table_id: str, row: int, col: int) -> Optional[str]:
         """获取表格单元格内容"""
-        if not self.load_tables:
-            return None
-        table = self._load_json(self.table_dir / f"{table_id}.json")
+        table = self._load_table(table_id)
         if not table:
             return None
         data = table.get('data', [])
@@ -155,10 +235,11 @@ class TableQADataset(Dataset):
     
     def __getitem__(self, idx: int) -> Dict[str, Any]:
         item = self.data[idx]
+        question_id = item['question_id']
         table_id = item['table_id']
         
         sample = {
-            'question_id': item['question_id'],
+            'question_id': question_id,
             'question': item['question'],
             'answer_text': item['answer-text'],
             'table_id': table_id,
@@ -171,15 +252,22 @@ class TableQADataset(Dataset):
             'difficulty': item.get('type', 'unknown'),
             'answer_source': item.get('where', 'unknown'),
             'question_postag': item.get('question_postag', ''),
-            'table': self._load_json(self.table_dir / f"{table_id}.json") if self.load_tables else None,
-            'passages': self._load_json(self.passage_dir / f"{table_id}.json") if self.load_passages else None,
-            'reference_answer': self.get_reference_answer(item['question_id'])
+            'table': self._load_table(table_id),
+            'passages': self._load_passages(table_id),
+            'reference_answer': self.get_reference_answer(question_id)
         }
         return sample
     
+    @staticmethod
+    def collate_fn(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        DataLoader 的 collate 函数：样本中含 None 和变长结构，直接以列表形式返回批次，
+        便于配合 num_workers > 0 在子进程中并行读取表格/passage
+        """
+        return list(batch)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """获取数据集统计信息"""
-        from collections import Counter
         return {
             'total_samples': len(self.data),
             'unique_tables': len(set(item['table_id'] for item in self.data)),